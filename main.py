@@ -1,12 +1,77 @@
 import argparse
 import sys
+import os
+import glob
 import json
-from src.data_fetcher import get_launches_by_date, get_tle_by_intdes
-from src.orbit_propagator import propagate_orbit
-from src.plotter import plot_ground_track
-from src.visualizer import create_animation
+from src.data_fetcher import get_launches_by_date, get_tles_by_intdes
 from src.logger import log
 
+def read_tle_file(path, default_name="Unknown"):
+    """
+    Reads a TLE from a local file (Name + 2 lines, or just the 2 lines).
+    
+    Args:
+        path (str): Path to the TLE file.
+        default_name (str): Name used when the file has no name line.
+        
+    Returns:
+        tuple: (line1, line2, name), or (None, None, None) if the file is not a TLE.
+    """
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if len(lines) >= 3:
+        return lines[1], lines[2], lines[0]
+    elif len(lines) == 2:
+        return lines[0], lines[1], default_name
+    return None, None, None
+
+def read_tle_dir(directory):
+    """
+    Reads every *.tle file of a directory.
+    
+    Files without a name line are named after the file (without extension).
+    
+    Args:
+        directory (str): Directory to scan.
+        
+    Returns:
+        list: (line1, line2, name) tuples, sorted by file name.
+    """
+    tles = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.tle'))):
+        try:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            line1, line2, name = read_tle_file(path, default_name=stem)
+            if line1 and line2:
+                tles.append((line1, line2, name))
+        except Exception as e:
+            log(f"Error reading TLE file {path}: {e}")
+    return tles
+
+def unique_names(names):
+    """
+    Makes satellite names unique, since output files are named after them.
+    
+    The first occurrence keeps its name; repeats get a _2, _3, ... suffix.
+    
+    Args:
+        names (list): Satellite names.
+        
+    Returns:
+        list: Unique names, in the same order.
+    """
+    seen = set()
+    result = []
+    for name in names:
+        unique = name
+        n = 2
+        while unique in seen:
+            unique = f"{name}_{n}"
+            n += 1
+        seen.add(unique)
+        result.append(unique)
+    return result
+
 def main():
     parser = argparse.ArgumentParser(description='Satellite Orbit Analysis Tool')
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
@@ -18,13 +83,17 @@ def main():
     
     # Command 2: Track object
     parser_track = subparsers.add_parser('track', help='Track an object')
-    parser_track.add_argument('intdes', help='International Designator (e.g. 1998-067A)')
+    parser_track.add_argument('intdes', nargs='*', help='International Designator(s) (e.g. 1998-067A); not needed with --tle-file/--tle-dir')
     parser_track.add_argument('-s', '--step', type=float, default=60.0, help='Time step in seconds (default: 60.0)')
     parser_track.add_argument('-c', '--count', type=int, default=4320, help='Number of steps (default: 4320)')
     parser_track.add_argument('--stations', help='Path to CSV file containing ground stations (name,lat,lon)')
     parser_track.add_argument('--tle-file', help='Path to TLE file to use instead of fetching')
+    parser_track.add_argument('--tle-dir', help='Directory of TLE files (*.tle) to propagate together')
+    parser_track.add_argument('--fp64', action='store_true', help='Keep results in float64 (default: float32, ~1 m resolution)')
     
     args = parser.parse_args()
+    if args.command == 'track' and not (args.intdes or args.tle_file or args.tle_dir):
+        parser_track.error('give at least one INT_DES, or --tle-file / --tle-dir')
     
     if args.command == 'search':
         log(f"Searching for launches on {args.date}...")
@@ -42,32 +111,38 @@ def main():
             log("No launches found for this date.")
             
     elif args.command == 'track':
-        line1, line2, name = None, None, None
+        # Heavy imports (skyfield, matplotlib, plotly, pandas) are only needed here
+        import numpy as np
+        from src.orbit_propagator import propagate_orbits, select_satellite
+        from src.plotter import plot_ground_track
+        from src.visualizer import create_animation
+        
+        tles = []
         
-        if args.tle_file:
+        if args.tle_dir:
+            log(f"Reading TLEs from {args.tle_dir}...")
+            tles = read_tle_dir(args.tle_dir)
+            log(f"Loaded {len(tles)} TLEs")
+        elif args.tle_file:
             log(f"Reading TLE from {args.tle_file}...")
             try:
-                with open(args.tle_file, 'r') as f:
-                    lines = f.readlines()
-                    if len(lines) >= 3:
-                        name = lines[0].strip()
-                        line1 = lines[1].strip()
-                        line2 = lines[2].strip()
-                    elif len(lines) == 2:
-                        name = "Unknown"
-                        line1 = lines[0].strip()
-                        line2 = lines[1].strip()
+                line1, line2, name = read_tle_file(args.tle_file)
+                if line1 and line2:
+                    tles.append((line1, line2, name))
                 log(f"Loaded TLE for {name}")
             except Exception as e:
                 log(f"Error reading TLE file: {e}")
         else:
-            log(f"Fetching TLE for {args.intdes}...")
-            line1, line2, name = get_tle_by_intdes(args.intdes)
+            log(f"Fetching TLE for {', '.join(args.intdes)}...")
+            # Fetched concurrently, one request per designator
+            for intdes, (line1, line2, name) in zip(args.intdes, get_tles_by_intdes(args.intdes)):
+                if line1 and line2:
+                    tles.append((line1, line2, name))
+                    log(f"Found TLE for {name}")
+                else:
+                    log(f"Failed to fetch TLE for {intdes}")
         
-        if line1 and line2:
-            if not args.tle_file:
-                log(f"Found TLE for {name}")
-            
+        if tles:
             # Load stations if provided
             stations = []
             if args.stations:
@@ -80,10 +155,17 @@ def main():
                     log(f"Error loading stations: {e}")
             
             log("Propagating orbit...")
-            positions, epoch_str = propagate_orbit(line1, line2, step_seconds=args.step, step_count=args.count, satellite_name=name)
-            log(f"Calculated {len(positions)} points.")
-            plot_ground_track(positions, name)
-            create_animation(positions, name, epoch_str, stations=stations)
+            # All satellites share one time grid and one propagation call
+            results, epochs = propagate_orbits([(line1, line2) for line1, line2, _ in tles],
+                                               step_seconds=args.step, step_count=args.count,
+                                               dtype=np.float64 if args.fp64 else np.float32)
+            # Output files are named after the satellite, so names must not repeat
+            names = unique_names([name for _, _, name in tles])
+            for i, name in enumerate(names):
+                positions = select_satellite(results, i)
+                log(f"Calculated {len(positions['time'])} points for {name}.")
+                plot_ground_track(positions, name)
+                create_animation(positions, name, epochs[i], stations=stations)
         else:
             log("Failed to fetch TLE.")
             
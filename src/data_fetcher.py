@@ -1,7 +1,110 @@
+import csv
+import json
+import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import time
 from .logger import log
 
+# Local cache for downloaded CelesTrak files
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'analyze_tle')
+
+# TLEs are refreshed by CelesTrak every few hours at most
+TLE_CACHE_TTL = 4 * 3600
+
+def _download_cached(url, filename):
+    """
+    Downloads a file into the cache directory using a conditional GET.
+    
+    The ETag / Last-Modified of the previous download are sent back, so an
+    unchanged file costs a 304 round trip instead of a full transfer.
+    If the request fails and a cached copy exists, the cached copy is used.
+    
+    Args:
+        url (str): URL to download.
+        filename (str): File name inside CACHE_DIR.
+        
+    Returns:
+        str: Path of the local copy.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, filename)
+    meta_path = path + '.meta.json'
+    
+    headers = {}
+    if os.path.exists(path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        except Exception:
+            # Unreadable validators: do a plain (full) download
+            headers = {}
+    
+    try:
+        with requests.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                log(f"Using cached {filename} (not modified)")
+                return path
+            response.raise_for_status()
+            
+            # Write to a temp file first so an interrupted download never replaces a good copy
+            tmp_path = path + '.part'
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+            
+            tmp_meta_path = meta_path + '.part'
+            with open(tmp_meta_path, 'w') as f:
+                json.dump({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }, f)
+            os.replace(tmp_meta_path, meta_path)
+    except Exception as e:
+        if not os.path.exists(path):
+            raise
+        log(f"Download failed ({e}), using cached {filename}")
+        
+    return path
+
+def _tle_cache_path(int_designator):
+    """Returns the cache file path for one designator (one file each, so parallel fetches never collide)."""
+    safe_name = "".join(c for c in int_designator if c.isalnum() or c == '-')
+    return os.path.join(CACHE_DIR, 'tle', f"{safe_name}.json")
+
+def _load_cached_tle(int_designator):
+    """
+    Loads a cached TLE.
+    
+    Returns:
+        tuple: ((line1, line2, name), age_seconds), or (None, None) if not cached.
+    """
+    try:
+        with open(_tle_cache_path(int_designator), 'r') as f:
+            entry = json.load(f)
+        return tuple(entry['tle']), time.time() - entry['fetched']
+    except Exception:
+        return None, None
+
+def _save_cached_tle(int_designator, tle):
+    """Stores a freshly fetched TLE with its fetch time."""
+    try:
+        path = _tle_cache_path(int_designator)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so a reader never sees a partial entry
+        tmp_path = path + '.part'
+        with open(tmp_path, 'w') as f:
+            json.dump({'fetched': time.time(), 'tle': list(tle)}, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log(f"Could not cache TLE: {e}")
+
 def get_launches_by_date(date_str):
     """
     Fetches satellite launch data for a specific date from CelesTrak SATCAT.
@@ -37,23 +140,21 @@ def get_launches_by_date(date_str):
     
     try:
         url = "https://celestrak.org/pub/satcat.csv"
-        # Download with stream to avoid massive memory usage if it grows
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        # Parse CSV
-        import csv
-        import io
-        
-        # Decode content
-        content = response.content.decode('utf-8')
-        f = io.StringIO(content)
-        reader = csv.DictReader(f)
+        # Only re-downloaded when CelesTrak has a newer copy
+        path = _download_cached(url, 'satcat.csv')
         
-        filtered_launches = []
-        for row in reader:
-            if row.get('LAUNCH_DATE') == date_str:
-                filtered_launches.append(row)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            # Parse CSV line by line, no full decode / StringIO copy
+            reader = csv.reader(f)
+            header = next(reader)
+            date_idx = header.index('LAUNCH_DATE')
+            
+            # Only build a dict for the matching rows
+            filtered_launches = [
+                dict(zip(header, row))
+                for row in reader
+                if len(row) > date_idx and row[date_idx] == date_str
+            ]
                 
         return filtered_launches
 
@@ -71,6 +172,12 @@ def get_tle_by_intdes(int_designator):
     Returns:
         list: [line1, line2] of TLE.
     """
+    # Recent enough cached copy: no request at all
+    cached_tle, age = _load_cached_tle(int_designator)
+    if cached_tle and age < TLE_CACHE_TTL:
+        log(f"Using cached TLE for {int_designator} ({age / 60:.0f} min old)")
+        return cached_tle
+    
     url = f"https://celestrak.org/NORAD/elements/gp.php?INTDES={int_designator}&FORMAT=TLE"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -84,17 +191,48 @@ def get_tle_by_intdes(int_designator):
             text = response.text.strip().splitlines()
             
             # TLE usually comes with a 0th line (name). We need the 1st and 2nd lines (the actual TLE).
+            tle = None
             if len(text) >= 3:
-                return text[1], text[2], text[0].strip()
+                tle = text[1], text[2], text[0].strip()
             elif len(text) == 2:
-                 return text[0], text[1], "Unknown" # Assuming no header
+                 tle = text[0], text[1], "Unknown" # Assuming no header
+            
+            if tle:
+                _save_cached_tle(int_designator, tle)
+                return tle
             
             # If we get here with empty/short text, maybe retry or fail
-            log(f"Received invalid TLE format on attempt {attempt+1}")
+            log(f"Received invalid TLE format for {int_designator} on attempt {attempt+1}")
             
         except Exception as e:
-            log(f"Error fetching TLE (Attempt {attempt+1}/3): {e}")
-            import time
+            log(f"Error fetching TLE for {int_designator} (Attempt {attempt+1}/3): {e}")
             time.sleep(2)
+    
+    # CelesTrak unavailable: an expired copy is still better than nothing
+    if cached_tle:
+        log(f"Using expired cached TLE for {int_designator} ({age / 3600:.1f} h old)")
+        return cached_tle
             
     return None, None, None
+
+def get_tles_by_intdes(int_designators, max_workers=8):
+    """
+    Fetches the latest TLEs for several International Designators in parallel.
+    
+    Each fetch is network-bound, so they run on a thread pool and the round
+    trips (and retry delays) overlap instead of adding up.
+    
+    Args:
+        int_designators (list): International Designators.
+        max_workers (int): Maximum number of concurrent requests.
+        
+    Returns:
+        list: (line1, line2, name) per designator, in input order.
+    """
+    if not int_designators:
+        return []
+    # Fetch repeated designators once, so no two workers write the same cache file
+    unique = list(dict.fromkeys(int_designators))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+        fetched = dict(zip(unique, executor.map(get_tle_by_intdes, unique)))
+    return [fetched[int_designator] for int_designator in int_designators]
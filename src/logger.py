@@ -1,6 +1,8 @@
 import datetime
+import sys
 
 def log(message):
     """Prints a message with the current UTC timestamp."""
     timestamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-    print(f"[{timestamp}] {message}")
+    # Single write per line, so messages from worker threads don't interleave
+    sys.stdout.write(f"[{timestamp}] {message}\n")
@@ -1,24 +1,143 @@
-from skyfield.api import EarthSatellite, load, wgs84
+from skyfield.api import EarthSatellite, load
+from skyfield.sgp4lib import theta_GMST1982
+from sgp4.api import SatrecArray, accelerated, jday
 import datetime
+import functools
 import numpy as np
+from .logger import log
 
-def propagate_orbit(tle_line1, tle_line2, step_seconds=600.0, step_count=144, satellite_name='Satellite', start_time=None):
+if not accelerated:
+    # sgp4 installed without its compiled extension runs the pure-Python
+    # SGP4 implementation, which is orders of magnitude slower.
+    log("Warning: sgp4 C++ extension not available, propagation will be slow.")
+
+# WGS84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+
+# Olson (1996) geodetic conversion coefficients (km)
+_OLSON_A1 = WGS84_A_KM * WGS84_E2
+_OLSON_A2 = _OLSON_A1 * _OLSON_A1
+_OLSON_A3 = _OLSON_A1 * WGS84_E2 / 2.0
+_OLSON_A4 = 2.5 * _OLSON_A2
+_OLSON_A5 = _OLSON_A1 + _OLSON_A3
+_OLSON_A6 = 1.0 - WGS84_E2
+
+@functools.lru_cache(maxsize=1)
+def _ts():
+    """Returns the shared Skyfield timescale, loaded once from the bundled tables."""
+    return load.timescale(builtin=True)
+
+def teme_to_geodetic(r_teme, gmst):
     """
-    Propagates the orbit of a satellite using TLE data.
+    Converts TEME positions to ECEF and WGS84 geodetic coordinates in one pass.
+    
+    The TEME -> ECEF step is a rotation about Z by the GMST 1982 angle (no polar
+    motion), which is the standard companion of SGP4 output. It is written out
+    element-wise, so no (N, 3, 3) rotation tensor is ever built.
     
     Args:
-        tle_line1 (str): Line 1 of the TLE.
-        tle_line2 (str): Line 2 of the TLE.
+        r_teme (ndarray): (..., N, 3) TEME positions in km.
+        gmst (ndarray): Greenwich mean sidereal angle in radians, shape (N,).
+        
+    Returns:
+        tuple: (lat_deg, lon_deg, alt_km, r_ecef) where r_ecef is (..., N, 3) in km.
+    """
+    c = np.cos(gmst)
+    s = np.sin(gmst)
+    x = r_teme[..., 0]
+    y = r_teme[..., 1]
+    
+    r_ecef = np.empty_like(r_teme)
+    r_ecef[..., 0] = c * x + s * y
+    r_ecef[..., 1] = c * y - s * x
+    r_ecef[..., 2] = r_teme[..., 2]
+    
+    lat, lon, alt = ecef_to_geodetic(r_ecef[..., 0], r_ecef[..., 1], r_ecef[..., 2])
+    return lat, lon, alt, r_ecef
+
+def ecef_to_geodetic(x, y, z):
+    """
+    Converts ECEF coordinates to WGS84 geodetic latitude, longitude and altitude.
+    
+    Olson (1996) closed-form method: no iteration, and both of its branches
+    (equatorial / polar) are evaluated with np.where, so it vectorizes over
+    any array shape. Accuracy is well below a millimetre for orbital altitudes.
+    
+    Args:
+        x, y, z (ndarray): ECEF coordinates in km.
+        
+    Returns:
+        tuple: (lat_deg, lon_deg, alt_km) arrays.
+    """
+    zp = np.abs(z)
+    w2 = x * x + y * y
+    w = np.sqrt(w2)
+    r2 = w2 + z * z
+    r = np.sqrt(r2)
+    s2 = z * z / r2
+    c2 = w2 / r2
+    u = _OLSON_A2 / r
+    v = _OLSON_A3 - _OLSON_A4 / r
+    
+    # Series for sin(lat) near the equator, cos(lat) near the poles
+    s_eq = (zp / r) * (1.0 + c2 * (_OLSON_A1 + u + s2 * v) / r)
+    c_po = (w / r) * (1.0 - s2 * (_OLSON_A5 - u - c2 * v) / r)
+    equatorial = c2 > 0.3
+    s = np.where(equatorial, s_eq, np.sqrt(np.maximum(1.0 - c_po * c_po, 0.0)))
+    c = np.where(equatorial, np.sqrt(np.maximum(1.0 - s_eq * s_eq, 0.0)), c_po)
+    lat = np.arctan2(s, c)
+    
+    # One closed-form correction step on the ellipsoid
+    g = 1.0 - WGS84_E2 * s * s
+    rg = WGS84_A_KM / np.sqrt(g)
+    rf = _OLSON_A6 * rg
+    u = w - rg * c
+    v = zp - rf * s
+    f = c * u + s * v
+    m = c * v - s * u
+    p = m / (rf / g + f)
+    lat = lat + p
+    alt = f + m * p / 2.0
+    lat = np.where(z < 0, -lat, lat)
+    lon = np.arctan2(y, x)
+    
+    return np.degrees(lat), np.degrees(lon), alt
+
+def propagate_orbits(tle_pairs, step_seconds=600.0, step_count=144, start_time=None, dtype=np.float64,
+                     *, ts=None, satellites=None):
+    """
+    Propagates several satellites over one shared time grid.
+    
+    The time grid, its Julian Dates and the GMST angles are computed once and
+    shared by every satellite; only the SGP4 call itself is per satellite.
+    
+    Args:
+        tle_pairs (list): List of (line1, line2) TLE tuples.
         step_seconds (float): Time step in seconds.
         step_count (int): Number of steps to propagate.
-        satellite_name (str): Name of the satellite.
         start_time (datetime, optional): Start time for propagation. Defaults to now.
+        dtype (type): Float type of the output columns. Computation is always
+                      float64; float32 (~1 m, ~1e-5 deg resolution) halves the
+                      output size.
+        ts (Timescale, optional): Skyfield timescale to reuse. Defaults to the
+                                  cached builtin timescale.
+        satellites (list, optional): Prebuilt EarthSatellite objects for
+                                     tle_pairs; skips parsing the TLEs again.
         
     Returns:
-        list: List of dictionaries containing time, lat, lon, alt.
+        tuple: (results, epochs) where results is a dict of column name ->
+               NumPy array of shape (n_sats, step_count), and epochs is the
+               list of TLE epoch strings.
     """
-    ts = load.timescale()
-    satellite = EarthSatellite(tle_line1, tle_line2, satellite_name, ts)
+    if ts is None:
+        ts = _ts()
+    if satellites is None:
+        satellites = [EarthSatellite(line1, line2, ts=ts) for line1, line2 in tle_pairs]
+    # C++ SGP4 kernel, propagates every satellite over the whole time array in one call.
+    # EarthSatellite already holds the parsed Satrec, so the TLEs are parsed only once.
+    satrecs = SatrecArray([satellite.model for satellite in satellites])
     
     if start_time is None:
         start_time = ts.now()
@@ -31,75 +150,95 @@ def propagate_orbit(tle_line1, tle_line2, step_seconds=600.0, step_count=144, sa
                 start_time = start_time.replace(tzinfo=datetime.timezone.utc)
             start_time = ts.from_datetime(start_time)
 
+    # utc_datetime() is always timezone aware (UTC)
     current_dt = start_time.utc_datetime()
     
-    # Ensure current_dt is strictly timezone aware
-    if current_dt.tzinfo is None:
-        current_dt = current_dt.replace(tzinfo=datetime.timezone.utc)
-        
     # Create time steps
     steps = np.arange(step_count) * step_seconds
-    # Create list of datetimes (list comprehension is fast for this size)
-    times_dt = [current_dt + datetime.timedelta(seconds=float(s)) for s in steps]
+    # Time grid as datetime64, no per-step Python datetime objects
+    t0 = np.datetime64(current_dt.replace(tzinfo=None), 'ns')
+    times64 = t0 + (steps * 1e9).astype('timedelta64[ns]')
     
     # Vectorized propagation
-    ts_times = ts.from_datetimes(times_dt)
-    geocentric = satellite.at(ts_times)
-    subpoint = wgs84.subpoint_of(geocentric)
-    
-    lats = subpoint.latitude.degrees
-    lons = subpoint.longitude.degrees
-    alts = subpoint.elevation.km
-    
-    # Fallback if altitude is 0 (Skyfield issue)
-    # WGS84 Semi-major axis approx 6378.137 km
-    EARTH_RADIUS_KM = 6378.137
-    
-    # Check if alts are all zeros (allow for small epsilon)
-    # Using simple heuristic: if max alt is < 1 km and radius is > 6500, something is wrong.
-    # We can check distance magnitude.
-    r_km = np.sqrt(np.sum(geocentric.position.km**2, axis=0))
-    
-    # If using numpy arrays
-    if np.any(r_km > 6500) and np.all(np.abs(alts) < 1.0):
-       # Calculate simple altitude
-       alts = r_km - EARTH_RADIUS_KM
-       
-    # Helper to ensure array if scalar (e.g., single point)
-    if np.ndim(alts) == 0:
-        alts = np.full(lats.shape, alts)
-        
+    # SGP4 expects UTC Julian Dates, split into whole + fraction. The start is
+    # split once with sgp4's jday (a single float JD only resolves ~40 us);
+    # the step offsets then go into the small fraction part.
+    jd0, fr0 = jday(current_dt.year, current_dt.month, current_dt.day,
+                    current_dt.hour, current_dt.minute,
+                    current_dt.second + current_dt.microsecond * 1e-6)
+    jd = np.full(step_count, jd0)
+    fr = fr0 + steps / 86400.0
+    # One C call for every (satellite, time) pair -> (n_sats, n_times, 3)
+    _, r_teme, _ = satrecs.sgp4(jd, fr)
+    
+    # TEME -> ECEF -> geodetic, skipping Skyfield's GCRS pipeline
+    # GMST depends on time only, so it broadcasts over the satellite axis
+    ts_times = start_time + steps / 86400.0
+    gmst, _ = theta_GMST1982(ts_times.whole, ts_times.ut1_fraction)
+    lats, lons, alts, r_ecef = teme_to_geodetic(r_teme, gmst)
+    
     # Extract 3D Coordinates
-    # ECI (GCRS via Skyfield)
-    eci_xyz = geocentric.position.km
-    x_eci, y_eci, z_eci = eci_xyz[0], eci_xyz[1], eci_xyz[2]
-    
-    # ECEF (ITRS via subpoint result)
-    # subpoint is a GeographicPosition which wraps ITRS
-    ecef_xyz = subpoint.itrs_xyz.km
-    x_ecef, y_ecef, z_ecef = ecef_xyz[0], ecef_xyz[1], ecef_xyz[2]
-    
-    # Ensure all are arrays for generic handling if scalar
-    if np.ndim(x_eci) == 0:
-        x_eci = np.full(lats.shape, x_eci)
-        y_eci = np.full(lats.shape, y_eci)
-        z_eci = np.full(lats.shape, z_eci)
-        x_ecef = np.full(lats.shape, x_ecef)
-        y_ecef = np.full(lats.shape, y_ecef)
-        z_ecef = np.full(lats.shape, z_ecef)
+    # ECI (TEME, as produced by SGP4)
+    x_eci, y_eci, z_eci = r_teme[..., 0], r_teme[..., 1], r_teme[..., 2]
+    
+    # ECEF (rotated from TEME by GMST)
+    x_ecef, y_ecef, z_ecef = r_ecef[..., 0], r_ecef[..., 1], r_ecef[..., 2]
+    
+    # Structure-of-arrays result, one column per quantity
+    # The time column is shared, broadcast (without copying) over satellites
+    results = {
+        'time': np.broadcast_to(times64, lats.shape),
+        'latitude': lats.astype(dtype, copy=False),
+        'longitude': lons.astype(dtype, copy=False),
+        'altitude_km': alts.astype(dtype, copy=False),
+        'eci_x': x_eci.astype(dtype, copy=False),
+        'eci_y': y_eci.astype(dtype, copy=False),
+        'eci_z': z_eci.astype(dtype, copy=False),
+        'ecef_x': x_ecef.astype(dtype, copy=False),
+        'ecef_y': y_ecef.astype(dtype, copy=False),
+        'ecef_z': z_ecef.astype(dtype, copy=False),
+    }
 
-    # Reassemble results
-    # Using list comprehension for speed
-    results = [
-        {
-            'time': dt,
-            'latitude': lat,
-            'longitude': lon,
-            'altitude_km': alt,
-            'eci': {'x': xe, 'y': ye, 'z': ze},
-            'ecef': {'x': xf, 'y': yf, 'z': zf}
-        }
-        for dt, lat, lon, alt, xe, ye, ze, xf, yf, zf in zip(times_dt, lats, lons, alts, x_eci, y_eci, z_eci, x_ecef, y_ecef, z_ecef)
-    ]
+    return results, [satellite.epoch.utc_jpl() for satellite in satellites]
 
-    return results, satellite.epoch.utc_jpl()
+def propagate_orbit(tle_line1, tle_line2, step_seconds=600.0, step_count=144, satellite_name='Satellite', start_time=None, dtype=np.float64,
+                    *, ts=None, satellite=None):
+    """
+    Propagates the orbit of a satellite using TLE data.
+    
+    Args:
+        tle_line1 (str): Line 1 of the TLE.
+        tle_line2 (str): Line 2 of the TLE.
+        step_seconds (float): Time step in seconds.
+        step_count (int): Number of steps to propagate.
+        satellite_name (str): Name given to the EarthSatellite built from the TLE
+                              (ignored when satellite is passed).
+        start_time (datetime, optional): Start time for propagation. Defaults to now.
+        dtype (type): Float type of the output columns (float32 or float64).
+        ts (Timescale, optional): Skyfield timescale to reuse.
+        satellite (EarthSatellite, optional): Prebuilt satellite for the TLE.
+        
+    Returns:
+        dict: Column name -> NumPy array (time, latitude, longitude, altitude_km,
+              eci_x/y/z, ecef_x/y/z), one entry per time step.
+    """
+    if ts is None:
+        ts = _ts()
+    if satellite is None:
+        satellite = EarthSatellite(tle_line1, tle_line2, satellite_name, ts=ts)
+    results, epochs = propagate_orbits([(tle_line1, tle_line2)], step_seconds, step_count, start_time, dtype,
+                                       ts=ts, satellites=[satellite])
+    return select_satellite(results, 0), epochs[0]
+
+def select_satellite(results, index):
+    """
+    Returns the columns of one satellite from a propagate_orbits result.
+    
+    Args:
+        results (dict): Result of propagate_orbits.
+        index (int): Satellite index.
+        
+    Returns:
+        dict: Column name -> 1D NumPy array (views, no copy).
+    """
+    return {key: values[index] for key, values in results.items()}
@@ -1,17 +1,61 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 from .logger import log
 
+# Width the background is reduced to; the 10x5 in figure is ~1000 px wide at 100 dpi
+MAP_MAX_WIDTH = 1024
+
+def _load_earth_map(map_filename):
+    """
+    Loads the Earth background image as an RGB array.
+    
+    The decoded, downscaled image is cached next to the JPEG as .npy and
+    memory-mapped on later runs, so the JPEG is only decoded once.
+    
+    Args:
+        map_filename (str): Path of the source image.
+        
+    Returns:
+        ndarray: (H, W, 3) image.
+    """
+    cache_filename = os.path.splitext(map_filename)[0] + '.npy'
+    if os.path.exists(cache_filename) and os.path.getmtime(cache_filename) >= os.path.getmtime(map_filename):
+        try:
+            return np.load(cache_filename, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            # Unreadable cache: decode the JPEG again and overwrite it
+            log(f"Rebuilding map cache ({e})")
+    
+    img = plt.imread(map_filename)
+    
+    # Downscale by block averaging to at most MAP_MAX_WIDTH pixels wide
+    factor = -(-img.shape[1] // MAP_MAX_WIDTH)
+    if factor > 1:
+        h = img.shape[0] // factor * factor
+        w = img.shape[1] // factor * factor
+        img = img[:h, :w].reshape(h // factor, factor, w // factor, factor, -1).mean(axis=(1, 3)).astype(img.dtype)
+    
+    # Write to a temp file first so an interrupted save never leaves a truncated cache
+    tmp_filename = cache_filename + '.part'
+    try:
+        with open(tmp_filename, 'wb') as f:
+            np.save(f, img)
+        os.replace(tmp_filename, cache_filename)
+    except OSError as e:
+        log(f"Could not cache map image: {e}")
+    return img
+
 def plot_ground_track(positions, object_name):
     """
     Plots the ground track of a satellite.
     
     Args:
-        positions (list): List of dictionaries containing lat/lon.
+        positions (dict): Column arrays from propagate_orbit (latitude, longitude).
         object_name (str): Name of the satellite.
     """
-    lats = [p['latitude'] for p in positions]
-    lons = [p['longitude'] for p in positions]
+    lats = positions['latitude']
+    lons = positions['longitude']
     
     plt.figure(figsize=(10, 5))
     
@@ -34,7 +78,7 @@ def plot_ground_track(positions, object_name):
             
     if os.path.exists(map_filename):
         try:
-            img = plt.imread(map_filename)
+            img = _load_earth_map(map_filename)
             plt.imshow(img, extent=[-180, 180, -90, 90])
         except Exception as e:
             log(f"Failed to load map image: {e}")
@@ -51,6 +95,8 @@ def plot_ground_track(positions, object_name):
     filename = f"{object_name.strip().replace(' ', '_')}_ground_track.png"
     output_path = os.path.join('output', filename)
     plt.savefig(output_path)
+    # Release the figure; with --tle-dir one is drawn per satellite
+    plt.close()
     log(f"Plot saved to {output_path}")
     # plt.show() # Don't show in headless/agent env usually, but we can if interactive.
     # For this agent workflow, saving is better.
@@ -1,5 +1,6 @@
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 from .logger import log
@@ -12,20 +13,21 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     - Right: 3D Orthographic projection (Globe) View.
     
     Args:
-        positions (list): List of dictionaries containing time, lat, lon, alt.
+        positions (dict): Column arrays from propagate_orbit (time, latitude, longitude, ...).
         object_name (str): Name of the satellite.
         tle_epoch (str): TLE Epoch string.
         stations (list): List of dicts (name, lat, lon) for ground stations.
     """
     log("Generating 3D/2D animation (Globe View)...")
     
+    # Convert to DataFrame for easier handling (columns are adopted as-is)
+    df = pd.DataFrame(positions)
+    
     # Check if we have data
-    if not positions:
+    if df.empty:
         log("No positions to visualize.")
         return
 
-    # Convert to DataFrame for easier handling
-    df = pd.DataFrame(positions)
     df['time_str'] = df['time'].astype(str)
     
     # Ensure TLE Epoch uses UTCG if it says UTC
@@ -46,11 +48,18 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     
     # --- Traces ---
     
+    # The static ground track only needs ~1000 vertices to look the same;
+    # every point is serialized into the HTML, so stride-downsample it.
+    # Full resolution is kept for the animated markers.
+    track_stride = max(1, int(np.ceil(len(df) / 1000)))
+    track_lons = df['longitude'].values[::track_stride]
+    track_lats = df['latitude'].values[::track_stride]
+    
     # Trace 1: Ground Track on 2D Map (Left)
     fig.add_trace(
         go.Scattergeo(
-            lon=df['longitude'],
-            lat=df['latitude'],
+            lon=track_lons,
+            lat=track_lats,
             mode='lines',
             line=dict(width=2, color='blue'),
             name='Ground Track (2D)'
@@ -62,8 +71,8 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     # We use Scattergeo again, but this will be projected onto the orthographic sphere
     fig.add_trace(
         go.Scattergeo(
-            lon=df['longitude'],
-            lat=df['latitude'],
+            lon=track_lons,
+            lat=track_lats,
             mode='lines',
             line=dict(width=2, color='red'),
             name='Orbit Path (3D)'
@@ -198,59 +207,60 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     
     frame_indices = range(0, len(df), skip)
     
-    for k in frame_indices:
-        row_data = df.iloc[k]
-        frame_time_str = str(row_data['time'])
-        
-        # Fixed width formatting for Lat/Lon
-        # Align decimal points by fixing total width to 11 chars (enough for -180.000000)
-        # >11.6f aligns to the right with spaces, ensuring dot alignment
-        lat_str = "{:>11.6f}".format(row_data['latitude'])
-        lon_str = "{:>11.6f}".format(row_data['longitude'])
-        
-        # Format with aligned colons using non-breaking spaces if needed, but monospace handles spaces well.
-        # labels: 'UTCG', 'Lat.', 'Lon'
-        # Max length 4 ('UTCG' w/o space? No 'UTCG ' is 5). 'Lat.' is 4. 'Lon' is 3.
-        # We want:
-        # UTCG : 
-        # Lat. : 
-        # Lon. : 
-        title_html = (
-            f"Satellite: {object_name} (TLE: {tle_epoch})<br>"
-            f"<span style='font-family: monospace; white-space: pre;'>"
-            f"UTCG : {frame_time_str}<br>"
-            f"Lat. : {lat_str}<br>"
-            f"Lon. : {lon_str}"
+    # Gather the frame samples once as raw arrays (no per-frame pandas indexing)
+    sel = slice(0, len(df), skip)
+    frame_lons = df['longitude'].values[sel]
+    frame_lats = df['latitude'].values[sel]
+    
+    # Pre-format the title fields for every frame in one vectorized pass
+    # Fixed width formatting for Lat/Lon
+    # Align decimal points by fixing total width to 11 chars (enough for -180.000000)
+    # %11.6f aligns to the right with spaces, ensuring dot alignment
+    # float32 columns only resolve ~1e-5 deg, so one digit fewer is printed for them
+    coord_fmt = '%11.5f' if frame_lats.dtype == np.float32 else '%11.6f'
+    time_strs = df['time_str'].values[sel]
+    lat_strs = np.char.mod(coord_fmt, frame_lats)
+    lon_strs = np.char.mod(coord_fmt, frame_lons)
+    
+    # Format with aligned colons using non-breaking spaces if needed, but monospace handles spaces well.
+    # labels: 'UTCG', 'Lat.', 'Lon'
+    # Max length 4 ('UTCG' w/o space? No 'UTCG ' is 5). 'Lat.' is 4. 'Lon' is 3.
+    # We want:
+    # UTCG : 
+    # Lat. : 
+    # Lon. : 
+    title_header = (
+        f"Satellite: {object_name} (TLE: {tle_epoch})<br>"
+        f"<span style='font-family: monospace; white-space: pre;'>"
+    )
+    
+    def title_at(i):
+        return (
+            f"{title_header}"
+            f"UTCG : {time_strs[i]}<br>"
+            f"Lat. : {lat_strs[i]}<br>"
+            f"Lon. : {lon_strs[i]}"
             f"</span>"
         )
+    
+    for i, k in enumerate(frame_indices):
+        lon = float(frame_lons[i])
+        lat = float(frame_lats[i])
         
-        frames.append(
-            go.Frame(
-                data=[
-                    # Update Trace 2 (Pos 2D)
-                    go.Scattergeo(
-                        lon=[row_data['longitude']],
-                        lat=[row_data['latitude']],
-                        mode='markers',
-                        marker=dict(size=10, color='red'),
-                    ),
-                    # Update Trace 3 (Pos 3D)
-                    go.Scattergeo(
-                        lon=[row_data['longitude']],
-                        lat=[row_data['latitude']],
-                        mode='markers',
-                        marker=dict(size=10, color='cyan')
-                    )
-                ],
-                layout=go.Layout(
-                    title_text=title_html
-                ),
-                traces=update_indices, 
-                name=f"frame{k}"
-            )
-        )
-        
-    fig.frames = frames
+        # Frames are plain dicts: they are serialized as-is, without building
+        # and validating a go.Frame / go.Scattergeo per frame.
+        # Only the position changes; mode/marker are inherited from the traces.
+        frames.append({
+            'data': [
+                # Update Trace 2 (Pos 2D)
+                {'type': 'scattergeo', 'lon': [lon], 'lat': [lat]},
+                # Update Trace 3 (Pos 3D)
+                {'type': 'scattergeo', 'lon': [lon], 'lat': [lat]},
+            ],
+            'layout': {'title': {'text': title_at(i)}},
+            'traces': update_indices,
+            'name': f"frame{k}",
+        })
 
     
     # --- Controls ---
@@ -291,17 +301,7 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     ]
     
     # Layout settings
-    lat_str = "{:>11.6f}".format(df.iloc[0]['latitude'])
-    lon_str = "{:>11.6f}".format(df.iloc[0]['longitude'])
-    
-    initial_title_html = (
-        f"Satellite: {object_name} (TLE: {tle_epoch})<br>"
-        f"<span style='font-family: monospace; white-space: pre;'>"
-        f"UTCG : {df.iloc[0]['time']}<br>"
-        f"Lat. : {lat_str}<br>"
-        f"Lon. : {lon_str}"
-        f"</span>"
-    )
+    initial_title_html = title_at(0)
     
     fig.update_layout(
         title_text=initial_title_html,
@@ -364,5 +364,10 @@ def create_animation(positions, object_name, tle_epoch, stations=[]):
     output_path = os.path.join('output', filename)
     
     log(f"Saving visualization to {output_path}...")
-    fig.write_html(output_path, auto_play=False)
+    # Attach the dict frames to the figure dict and write it without
+    # re-validating (the traces/layout were already validated by go.Figure).
+    # Load plotly.js from the CDN instead of embedding ~3 MB in every file
+    fig_dict = fig.to_dict()
+    fig_dict['frames'] = frames
+    pio.write_html(fig_dict, output_path, auto_play=False, include_plotlyjs='cdn', validate=False)
     log("Done.")
@@ -1,14 +1,19 @@
 import unittest
 from unittest.mock import patch, MagicMock
-import sys
 import os
+import tempfile
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from src.data_fetcher import get_tle_by_intdes
+from src.data_fetcher import get_launches_by_date, get_tle_by_intdes, get_tles_by_intdes
 
 class TestDataFetcher(unittest.TestCase):
-    
+    def setUp(self):
+        # Keep the download cache out of the user's home directory
+        self.cache_dir = tempfile.TemporaryDirectory()
+        cache_patcher = patch('src.data_fetcher.CACHE_DIR', self.cache_dir.name)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.addCleanup(self.cache_dir.cleanup)
+
     @patch('src.data_fetcher.requests.get')
     def test_fetch_success(self, mock_get):
         """Test successful TLE retrieval."""
@@ -45,5 +50,100 @@ class TestDataFetcher(unittest.TestCase):
         result = get_tle_by_intdes("INVALID")
         self.assertEqual(result, (None, None, None))
 
-if __name__ == '__main__':
-    unittest.main()
+    @patch('src.data_fetcher.requests.get')
+    def test_fetch_cached(self, mock_get):
+        """Test a fresh cached TLE is returned without a new request."""
+        mock_response = MagicMock()
+        mock_response.text = "OBJECT_NAME\n1 12345U\n2 12345\n"
+        mock_get.return_value = mock_response
+        
+        first = get_tle_by_intdes("1998-067A")
+        second = get_tle_by_intdes("1998-067A")
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('src.data_fetcher.time.sleep')
+    @patch('src.data_fetcher.requests.get')
+    def test_fetch_expired_cache_fallback(self, mock_get, mock_sleep):
+        """Test an expired cached TLE is used when CelesTrak is unavailable."""
+        mock_response = MagicMock()
+        mock_response.text = "OBJECT_NAME\n1 12345U\n2 12345\n"
+        mock_get.return_value = mock_response
+        get_tle_by_intdes("1998-067A")
+        
+        mock_get.return_value.raise_for_status.side_effect = Exception("403 Forbidden")
+        with patch('src.data_fetcher.TLE_CACHE_TTL', -1):
+            result = get_tle_by_intdes("1998-067A")
+        
+        self.assertEqual(result, ("1 12345U", "2 12345", "OBJECT_NAME"))
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch('src.data_fetcher.get_tle_by_intdes')
+    def test_fetch_many(self, mock_fetch):
+        """Test parallel fetches return one TLE per designator, in order."""
+        mock_fetch.side_effect = lambda intdes: ("1 " + intdes, "2 " + intdes, intdes)
+        
+        results = get_tles_by_intdes(["1998-067A", "2025-241A", "2025-241B"])
+        
+        self.assertEqual([name for _, _, name in results], ["1998-067A", "2025-241A", "2025-241B"])
+        self.assertEqual(get_tles_by_intdes([]), [])
+        
+        # Repeated designators are fetched once but still returned per input
+        mock_fetch.reset_mock()
+        results = get_tles_by_intdes(["1998-067A", "2025-241A", "1998-067A"])
+        self.assertEqual([name for _, _, name in results], ["1998-067A", "2025-241A", "1998-067A"])
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    def _satcat_response(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {'ETag': '"abc"'}
+        mock_response.iter_content.return_value = iter([
+            b"OBJECT_NAME,OBJECT_ID,LAUNCH_DATE\n",
+            b"ISS (ZARYA),1998-067A,1998-11-20\n",
+            b"OBJECT A,2025-241A,2025-10-01\n",
+            b"OBJECT B,2025-241B,2025-10-01\n",
+        ])
+        return mock_response
+
+    @patch('src.data_fetcher.requests.get')
+    def test_launches_by_date(self, mock_get):
+        """Test SATCAT rows are filtered by launch date."""
+        mock_get.return_value.__enter__.return_value = self._satcat_response()
+        
+        results = get_launches_by_date("2025-10-01")
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['OBJECT_NAME'], "OBJECT A")
+        self.assertEqual(results[1]['OBJECT_ID'], "2025-241B")
+
+    @patch('src.data_fetcher.requests.get')
+    def test_launches_cached(self, mock_get):
+        """Test a 304 response reuses the cached SATCAT."""
+        mock_get.return_value.__enter__.return_value = self._satcat_response()
+        get_launches_by_date("2025-10-01")
+        
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        mock_get.return_value.__enter__.return_value = not_modified
+        
+        results = get_launches_by_date("1998-11-20")
+        
+        self.assertEqual(mock_get.call_args.kwargs['headers']['If-None-Match'], '"abc"')
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['OBJECT_ID'], "1998-067A")
+
+    @patch('src.data_fetcher.requests.get')
+    def test_launches_corrupt_meta(self, mock_get):
+        """Test an unreadable meta file falls back to a full download."""
+        mock_get.return_value.__enter__.return_value = self._satcat_response()
+        get_launches_by_date("2025-10-01")
+        open(os.path.join(self.cache_dir.name, 'satcat.csv.meta.json'), 'w').close()
+        
+        mock_get.return_value.__enter__.return_value = self._satcat_response()
+        results = get_launches_by_date("2025-10-01")
+        
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {})
+        self.assertEqual(len(results), 2)
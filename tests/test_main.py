@@ -0,0 +1,42 @@
+import unittest
+import os
+import tempfile
+
+from main import read_tle_dir, unique_names
+
+ISS_LINE1 = "1 25544U 98067A   25340.55621404  .00016717  00000+0  30129-3 0  9993"
+ISS_LINE2 = "2 25544  51.6396 235.9181 0006764 266.3025 210.1504 15.49479342528256"
+
+class TestTleDir(unittest.TestCase):
+    def setUp(self):
+        self.tle_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tle_dir.cleanup)
+
+    def _write(self, filename, lines):
+        with open(os.path.join(self.tle_dir.name, filename), 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def test_nameless_files_use_file_stem(self):
+        """Test two-line TLE files are named after their file, so outputs don't collide."""
+        self._write("iss.tle", [ISS_LINE1, ISS_LINE2])
+        self._write("geo.tle", [ISS_LINE1, ISS_LINE2])
+        self._write("notes.txt", ["not a TLE"])
+        
+        tles = read_tle_dir(self.tle_dir.name)
+        
+        self.assertEqual([name for _, _, name in tles], ["geo", "iss"])
+        self.assertEqual(tles[0][:2], (ISS_LINE1, ISS_LINE2))
+
+    def test_named_file_keeps_its_name(self):
+        """Test the name line of a three-line TLE file is used."""
+        self._write("a.tle", ["ISS (ZARYA)", ISS_LINE1, ISS_LINE2])
+        
+        tles = read_tle_dir(self.tle_dir.name)
+        
+        self.assertEqual(tles, [(ISS_LINE1, ISS_LINE2, "ISS (ZARYA)")])
+
+    def test_unique_names(self):
+        """Test repeated satellite names get a numeric suffix."""
+        self.assertEqual(unique_names(["Unknown", "Unknown", "ISS", "Unknown"]),
+                         ["Unknown", "Unknown_2", "ISS", "Unknown_3"])
+        self.assertEqual(unique_names(["A", "A_2", "A"]), ["A", "A_2", "A_3"])
@@ -1,56 +1,120 @@
 import unittest
-from datetime import datetime
-import sys
-import os
+from datetime import datetime, timezone
+import numpy as np
 
-# Add src to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from skyfield.api import EarthSatellite, wgs84
+from skyfield.framelib import itrs
 
-from src.orbit_propagator import propagate_orbit
+from src.orbit_propagator import (_ts, ecef_to_geodetic, propagate_orbit, propagate_orbits,
+                                  WGS84_A_KM, WGS84_E2)
 
 class TestOrbitPropagator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Timescale and parsed TLE are shared by every test in the class
+        cls.tle_line1 = "1 25544U 98067A   25340.55621404  .00016717  00000+0  30129-3 0  9993"
+        cls.tle_line2 = "2 25544  51.6396 235.9181 0006764 266.3025 210.1504 15.49479342528256"
+        cls.ts = _ts()
+        cls.satellite = EarthSatellite(cls.tle_line1, cls.tle_line2, ts=cls.ts)
+
     def setUp(self):
-        self.tle_line1 = "1 25544U 98067A   25340.55621404  .00016717  00000+0  30129-3 0  9993"
-        self.tle_line2 = "2 25544  51.6396 235.9181 0006764 266.3025 210.1504 15.49479342528256"
         self.count = 10
         self.step = 60
 
     def test_propagation_result_structure(self):
         """Test if the propagator returns the correct structure and count."""
-        results, epoch_str = propagate_orbit(self.tle_line1, self.tle_line2, self.step, self.count)
+        results, epoch_str = propagate_orbit(self.tle_line1, self.tle_line2, self.step, self.count,
+                                             ts=self.ts, satellite=self.satellite)
         
         # Check return count
-        self.assertEqual(len(results), self.count)
+        self.assertEqual(len(results['time']), self.count)
         
         # Check epoch string presence
         self.assertIsInstance(epoch_str, str)
         self.assertIn("UTC", epoch_str) # Standard Skyfield output usually contains UTC
         
-        # Check first point integrity
-        point = results[0]
-        required_keys = ['time', 'latitude', 'longitude', 'altitude_km', 'eci', 'ecef']
-        for key in required_keys:
-            self.assertIn(key, point)
-            
-        # Check ECI/ECEF structure
-        self.assertIn('x', point['eci'])
-        self.assertIn('y', point['eci'])
-        self.assertIn('z', point['eci'])
-        self.assertIn('x', point['ecef'])
+        # Check column integrity
+        required_keys = {'time', 'latitude', 'longitude', 'altitude_km',
+                         'eci_x', 'eci_y', 'eci_z', 'ecef_x', 'ecef_y', 'ecef_z'}
+        self.assertLessEqual(required_keys, results.keys())
+        self.assertEqual({len(values) for values in results.values()}, {self.count})
 
     def test_values_range(self):
         """Test if propagated values are within reasonable ranges."""
         # Use TLE epoch approx (2025-12-06)
         start_time = datetime(2025, 12, 6, 13, 0, 0)
-        results, _ = propagate_orbit(self.tle_line1, self.tle_line2, 60, 5, start_time=start_time)
-        
-        for p in results:
-            print(f"DEBUG POINT: {p}")
-            self.assertTrue(bool(-90 <= p['latitude'] <= 90))
-            self.assertTrue(bool(-180 <= p['longitude'] <= 180))
-            # ISS altitude roughly 400km
-            alt = float(p['altitude_km'])
-            self.assertTrue(300 < alt < 500, f"Altitude {alt} out of range")
-
-if __name__ == '__main__':
-    unittest.main()
+        results, _ = propagate_orbit(self.tle_line1, self.tle_line2, 60, 5, start_time=start_time,
+                                     ts=self.ts, satellite=self.satellite)
+        
+        lat = results['latitude']
+        lon = results['longitude']
+        alt = results['altitude_km']
+        np.testing.assert_array_less(-90.0001, lat)
+        np.testing.assert_array_less(lat, 90.0001)
+        np.testing.assert_array_less(-180.0001, lon)
+        np.testing.assert_array_less(lon, 180.0001)
+        # ISS altitude roughly 400km
+        np.testing.assert_array_less(300, alt)
+        np.testing.assert_array_less(alt, 500)
+
+    def test_matches_skyfield(self):
+        """Test the TEME -> ECEF -> geodetic pipeline against Skyfield's own."""
+        start_time = datetime(2025, 12, 6, 13, 0, 0, tzinfo=timezone.utc)
+        results, _ = propagate_orbit(self.tle_line1, self.tle_line2, 600, 20, start_time=start_time,
+                                     dtype=np.float64, ts=self.ts, satellite=self.satellite)
+        
+        t = self.ts.from_datetime(start_time) + np.arange(20) * 600 / 86400.0
+        position = self.satellite.at(t)
+        ecef = position.frame_xyz(itrs).km
+        geo = wgs84.geographic_position_of(position)
+        
+        np.testing.assert_allclose(results['ecef_x'], ecef[0], rtol=0, atol=1e-6)
+        np.testing.assert_allclose(results['ecef_y'], ecef[1], rtol=0, atol=1e-6)
+        np.testing.assert_allclose(results['ecef_z'], ecef[2], rtol=0, atol=1e-6)
+        np.testing.assert_allclose(results['latitude'], geo.latitude.degrees, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(results['longitude'], geo.longitude.degrees, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(results['altitude_km'], geo.elevation.km, rtol=0, atol=1e-6)
+
+    def test_batch_propagation(self):
+        """Test if several TLEs are propagated onto one shared time grid."""
+        start_time = datetime(2025, 12, 6, 13, 0, 0)
+        tle_pairs = [(self.tle_line1, self.tle_line2)] * 3
+        results, epochs = propagate_orbits(tle_pairs, self.step, self.count, start_time=start_time)
+        
+        self.assertEqual(len(epochs), 3)
+        for key, values in results.items():
+            self.assertEqual(values.shape, (3, self.count), key)
+        
+        # Each row must match the single-satellite propagation
+        single, _ = propagate_orbit(self.tle_line1, self.tle_line2, self.step, self.count, start_time=start_time,
+                                    ts=self.ts, satellite=self.satellite)
+        self.assertEqual(list(results['latitude'][2]), list(single['latitude']))
+
+class TestEcefToGeodetic(unittest.TestCase):
+    @staticmethod
+    def _to_ecef(lat_deg, lon_deg, alt_km):
+        # Standard geodetic -> ECEF on the WGS84 ellipsoid
+        lat = np.radians(lat_deg)
+        lon = np.radians(lon_deg)
+        n = WGS84_A_KM / np.sqrt(1.0 - WGS84_E2 * np.sin(lat)**2)
+        return ((n + alt_km) * np.cos(lat) * np.cos(lon),
+                (n + alt_km) * np.cos(lat) * np.sin(lon),
+                (n * (1.0 - WGS84_E2) + alt_km) * np.sin(lat))
+
+    def test_known_points(self):
+        """Test equator, poles and southern-hemisphere points (both Olson branches)."""
+        cases = [
+            (0.0, 0.0, 400.0),        # equator
+            (90.0, 0.0, 400.0),       # north pole
+            (-90.0, 0.0, 400.0),      # south pole
+            (-33.9, 151.2, 400.0),    # southern hemisphere, equatorial branch
+            (-75.0, -60.0, 800.0),    # southern hemisphere, polar branch
+        ]
+        for lat, lon, alt in cases:
+            with self.subTest(lat=lat, lon=lon):
+                got_lat, got_lon, got_alt = ecef_to_geodetic(*self._to_ecef(lat, lon, alt))
+                self.assertAlmostEqual(float(got_lat), lat, places=9)
+                self.assertAlmostEqual(float(got_alt), alt, places=9)
+                if abs(lat) < 90.0:
+                    # Longitude is undefined at the poles
+                    self.assertAlmostEqual(float(got_lon), lon, places=9)